@@ -0,0 +1,686 @@
+# !/usr/bin/env python3 -u
+# copyright: sktime developers, BSD-3-Clause License (see LICENSE file)
+"""Implements Chronos forecaster."""
+
+__author__ = ["Z-Fran"]
+# Z-Fran
+
+import functools
+
+import numpy as np
+import pandas as pd
+
+from sktime.forecasting.base import BaseForecaster, ForecastingHorizon
+from sktime.utils.validation._dependencies import _check_soft_dependencies
+
+if _check_soft_dependencies("torch", severity="none"):
+    import torch
+
+if _check_soft_dependencies("transformers", severity="none"):
+    import transformers
+
+
+__all__ = ["ChronosForecaster"]
+
+
+@functools.lru_cache(maxsize=4)
+def _load_pipeline(model_path, torch_dtype, device_map, quantization="none"):
+    """Load a ChronosPipeline, cached at process level.
+
+    Caching avoids re-reading the model weights for every new
+    ``ChronosForecaster`` instance with identical settings.
+    ``torch_dtype`` is the string name of a ``torch`` dtype, so that all
+    components of the cache key are hashable.
+    """
+    from chronos import ChronosPipeline
+
+    pipeline = ChronosPipeline.from_pretrained(
+        model_path,
+        device_map=device_map,
+        torch_dtype=getattr(torch, torch_dtype),
+    )
+    if quantization != "none":
+        _quantize_linear_layers(pipeline.model, quantization)
+    return pipeline
+
+
+def _quantize_linear_layers(model, quantization):
+    """Replace ``nn.Linear`` layers with bitsandbytes weight-only variants.
+
+    Weight-only INT8/NF4 cuts weight memory traffic by 2-4x on the
+    memory-bound decoder matmuls, at negligible accuracy cost.
+
+    Parameters
+    ----------
+    model : torch.nn.Module
+        Model whose linear layers are replaced in place.
+    quantization : str
+        One of "int8" or "nf4".
+    """
+    _check_soft_dependencies(
+        "bitsandbytes",
+        msg=(
+            'the "quantization" option of ChronosForecaster requires the '
+            "bitsandbytes package, but bitsandbytes is not installed"
+        ),
+    )
+    import bitsandbytes as bnb
+
+    device = next(model.parameters()).device
+
+    def _replace(module):
+        for name, child in module.named_children():
+            if isinstance(child, torch.nn.Linear):
+                if quantization == "int8":
+                    new_layer = bnb.nn.Linear8bitLt(
+                        child.in_features,
+                        child.out_features,
+                        bias=child.bias is not None,
+                        has_fp16_weights=False,
+                        threshold=6.0,
+                    )
+                else:
+                    new_layer = bnb.nn.Linear4bit(
+                        child.in_features,
+                        child.out_features,
+                        bias=child.bias is not None,
+                        quant_type="nf4",
+                        compute_dtype=torch.bfloat16,
+                    )
+                new_layer.load_state_dict(child.state_dict())
+                setattr(module, name, new_layer)
+            else:
+                _replace(child)
+
+    _replace(model)
+    # moving to the target device triggers the actual weight quantization
+    model.to(device)
+
+
+@functools.lru_cache(maxsize=1)
+def _limit_interop_threads():
+    """Set torch inter-op parallelism to one thread, once per process."""
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # torch only allows setting this before the first parallel op
+        pass
+    return True
+
+
+@functools.lru_cache(maxsize=1)
+def _get_sample_reducer():
+    """Return the median-over-samples reduction, compiled when possible.
+
+    ``torch.compile`` fuses the sort-based median with the output write
+    into a single pass over the sample tensor; on platforms without
+    compile support the eager reduction is returned unchanged.
+    """
+
+    def _reduce(samples):
+        # samples: (n_series, num_samples, prediction_length)
+        return samples.median(dim=1).values
+
+    try:
+        return torch.compile(_reduce, mode="reduce-overhead", dynamic=True)
+    except Exception:
+        return _reduce
+
+
+def _reduce_samples(samples):
+    """Median over the sample dimension of a batched sample tensor."""
+    reducer = _get_sample_reducer()
+    try:
+        return reducer(samples)
+    except Exception:
+        # compiled path can fail at call time on exotic backends,
+        # eager median is always a safe fallback
+        return samples.median(dim=1).values
+
+
+def _cpu_supports_bf16():
+    """Check whether the CPU has native bfloat16 compute support."""
+    try:
+        return bool(torch.cpu._is_avx512_bf16_supported()) or bool(
+            torch.cpu._is_amx_tile_supported()
+        )
+    except AttributeError:
+        pass
+    try:
+        with open("/proc/cpuinfo") as f:
+            return "avx512_bf16" in f.read()
+    except OSError:
+        return False
+
+
+class ChronosForecaster(BaseForecaster):
+    """Interface to the Chronos Zero-Shot Forecaster by Amazon Research [1]_.
+
+    Chronos is a family of pretrained time series forecasting models
+    based on language model architectures. A time series is transformed
+    into a sequence of tokens via scaling and quantization, and a language
+    model is trained on these tokens using the cross-entropy loss. Once
+    trained, probabilistic forecasts are obtained by sampling multiple
+    future trajectories given the historical context [2]_.
+
+    Parameters
+    ----------
+    model_path : str
+        Path to the Chronos huggingface model, e.g. "amazon/chronos-t5-tiny".
+    config : dict, optional, default=None
+        A dictionary specifying the configuration settings for the model.
+        The available configuration options are the keys of
+        ``ChronosForecaster._default_config``, see below.
+
+        - "num_samples" : int, default=None
+          Number of sample paths to draw per series. ``None`` uses the
+          default of the underlying pipeline.
+        - "temperature" : float, default=None
+          Sampling temperature; ``None`` uses the pipeline default.
+        - "top_k" : int, default=None
+          Top-k sampling parameter; ``None`` uses the pipeline default.
+        - "top_p" : float, default=None
+          Top-p sampling parameter; ``None`` uses the pipeline default.
+        - "limit_prediction_length" : bool, default=False
+          Whether to raise an error if the prediction length exceeds the
+          model's training prediction length.
+        - "torch_dtype" : str, default="bfloat16"
+          Name of the ``torch`` dtype to load the model weights in.
+          If not set explicitly, falls back to "float32" on CPUs
+          without native bfloat16 support.
+        - "device_map" : str, default="cpu"
+          Device to load the model on, e.g. "cpu" or "cuda".
+        - "context_length" : int, default=512
+          Maximum number of trailing observations per series that are
+          passed to the model as context.
+        - "quantization" : str, one of "none" (default), "int8", "nf4"
+          Weight-only quantization of the model's linear layers, using
+          ``bitsandbytes``. Requires ``bitsandbytes`` to be installed
+          and a CUDA ``device_map``, since bitsandbytes only quantizes
+          weights on CUDA devices.
+        - "num_threads" : int, default=None
+          Number of torch intra-op threads to use during predict on CPU,
+          restored to the previous value afterwards. ``None`` leaves the
+          torch default untouched. Useful to match physical core count
+          when forecasting inside parallel pipelines.
+        - "batch_size" : int, default=None
+          Number of series per pipeline call for panel data. ``None``
+          picks the size automatically: from free device memory on CUDA,
+          capped at 32 series per call on CPU.
+
+    seed : int, optional, default=None
+        Random seed for transformers, for reproducible sampling.
+
+    References
+    ----------
+    .. [1] https://github.com/amazon-science/chronos-forecasting
+    .. [2] Ansari, A. F. et al (2024).
+       Chronos: Learning the Language of Time Series.
+
+    Examples
+    --------
+    >>> from sktime.forecasting.chronos import ChronosForecaster
+    >>> from sktime.datasets import load_airline
+    >>> y = load_airline()
+    >>> forecaster = ChronosForecaster("amazon/chronos-t5-tiny")  # doctest: +SKIP
+    >>> forecaster.fit(y)  # doctest: +SKIP
+    ChronosForecaster(...)
+    >>> y_pred = forecaster.predict(fh=[1, 2, 3])  # doctest: +SKIP
+    """
+
+    _tags = {
+        # packaging info
+        # --------------
+        "authors": ["Z-Fran"],
+        "maintainers": ["Z-Fran"],
+        "python_dependencies": ["torch", "transformers", "chronos-forecasting"],
+        "python_dependencies_alias": {"chronos-forecasting": "chronos"},
+        # estimator type
+        # --------------
+        "scitype:y": "univariate",
+        "y_inner_mtype": [
+            "pd.DataFrame",
+            "pd-multiindex",
+            "pd_multiindex_hier",
+        ],
+        "ignores-exogeneous-X": True,
+        "requires-fh-in-fit": False,
+        "handles-missing-data": False,
+        "capability:insample": False,
+        "capability:pred_int": False,
+        "capability:pred_int:insample": False,
+    }
+
+    _default_config = {
+        "num_samples": None,
+        "temperature": None,
+        "top_k": None,
+        "top_p": None,
+        "limit_prediction_length": False,
+        "torch_dtype": "bfloat16",
+        "device_map": "cpu",
+        "context_length": 512,
+        "quantization": "none",
+        "num_threads": None,
+        "batch_size": None,
+    }
+
+    def __init__(self, model_path, config=None, seed=None):
+        self.model_path = model_path
+        self.config = config
+        self._config = self._default_config.copy()
+        self._config.update(config or {})
+
+        # bfloat16 matmuls fall back to slow emulation on CPUs without
+        # native bf16 support, so default to full precision there;
+        # an explicitly configured torch_dtype is left untouched
+        if (
+            "torch_dtype" not in (config or {})
+            and self._config["device_map"] == "cpu"
+            and _check_soft_dependencies("torch", severity="none")
+            and not _cpu_supports_bf16()
+        ):
+            self._config["torch_dtype"] = "float32"
+
+        self.seed = seed
+        self._seed = np.random.randint(0, 2**31) if seed is None else seed
+
+        self.model_pipeline = None
+        self._pred_buf = None
+        self._pred_buf_key = None
+
+        super().__init__()
+
+    def _fit(self, y, X, fh):
+        """Fit forecaster to training data.
+
+        Loads the pretrained Chronos pipeline, no model parameters are updated.
+
+        Parameters
+        ----------
+        y : pd.DataFrame
+            Time series to which to fit the forecaster.
+        X : pd.DataFrame, optional (default=None)
+            Ignored, exogeneous data is not supported.
+        fh : ForecastingHorizon, optional (default=None)
+            The forecasting horizon with the steps ahead to predict.
+
+        Returns
+        -------
+        self : reference to self
+        """
+        # shape invariants of the training panel are computed once here,
+        # so predict does not re-validate them on every call
+        self._y_is_multi = isinstance(y.index, pd.MultiIndex)
+        if self._y_is_multi:
+            _, length = _same_index(y)
+            self._y_length = length
+            self._y_n_series = len(y) // length
+            self._y_instances = y.index.droplevel(-1).unique()
+        else:
+            self._y_length = len(y)
+            self._y_n_series = 1
+            self._y_instances = None
+        self._y_columns = y.columns
+
+        # validate the quantization setting before any loading happens,
+        # so config typos do not surface as dependency or bnb errors
+        quantization = self._config["quantization"]
+        if quantization not in ("none", "int8", "nf4"):
+            raise ValueError(
+                'config "quantization" must be one of "none", "int8", "nf4", '
+                f"but found {quantization}"
+            )
+        if quantization != "none" and not str(self._config["device_map"]).startswith(
+            "cuda"
+        ):
+            raise ValueError(
+                'config "quantization" requires a CUDA device_map, since '
+                "bitsandbytes only quantizes weights on CUDA, but found "
+                f'device_map={self._config["device_map"]!r}'
+            )
+
+        if self.model_pipeline is None:
+            self.model_pipeline = _load_pipeline(
+                self.model_path,
+                self._config["torch_dtype"],
+                self._config["device_map"],
+                quantization=self._config["quantization"],
+            )
+
+        return self
+
+    def _predict_single_series(self, _y, prediction_length):
+        """Forecast a single flat-indexed series.
+
+        Specialized path for the common non-panel case: the series buffer
+        is sliced and handed to the model directly, and the output frame
+        is built with a flat index, avoiding the panel reshape and
+        MultiIndex construction of the general path.
+
+        Parameters
+        ----------
+        _y : pd.DataFrame
+            Series to predict from, with a flat (non-MultiIndex) index.
+        prediction_length : int
+            Number of steps ahead to predict.
+
+        Returns
+        -------
+        pd.DataFrame
+            Point predictions, filtered to the requested horizon.
+        """
+        context_length = self._config["context_length"]
+        values = _y.to_numpy(dtype=np.float32)[-context_length:, 0]
+        context = torch.from_numpy(np.ascontiguousarray(values)).unsqueeze(0)
+
+        samples = self._predict_samples(context, prediction_length)
+        median = _reduce_samples(samples)[0].to("cpu", dtype=torch.float32).numpy()
+
+        fh_abs = (
+            ForecastingHorizon(range(1, prediction_length + 1), freq=self.fh.freq)
+            .to_absolute(self._cutoff)
+            ._values
+        )
+        pred_out = self.fh.to_absolute(self.cutoff)._values
+        keep = fh_abs.isin(pred_out)
+
+        return pd.DataFrame(
+            median[keep].reshape(-1, 1),
+            index=fh_abs[keep],
+            columns=_y.columns,
+        )
+
+    def _resolve_batch_size(self, n_series):
+        """Pick the series batch size for one predict call.
+
+        An explicitly configured "batch_size" wins. Otherwise, on CUDA
+        the size is derived from currently free device memory, and on
+        CPU it is capped at 32 to bound the working set of the sample
+        tensor; either way the whole panel is covered in ceil(n/b)
+        pipeline calls.
+        """
+        batch_size = self._config["batch_size"]
+        if batch_size is not None:
+            return max(1, int(batch_size))
+        if str(self._config["device_map"]).startswith("cuda"):
+            free_mem, _ = torch.cuda.mem_get_info()
+            # coarse per-series budget for activations and samples,
+            # scaled by the context window relative to the 512 default
+            per_series = 64 * 2**20 * max(1, self._config["context_length"] // 512)
+            return max(1, min(n_series, int(free_mem * 0.8 / per_series)))
+        return min(n_series, 32)
+
+    def _predict_samples(self, context, prediction_length):
+        """Draw forecast samples for a batched context tensor.
+
+        Runs the pipeline under ``torch.inference_mode`` to drop autograd
+        bookkeeping, and under autocast where the hardware supports half
+        precision: fp16 on CUDA, bf16 on CPUs with native bf16 support.
+
+        Parameters
+        ----------
+        context : torch.Tensor
+            Batched context tensor of shape (n_series, context_length).
+        prediction_length : int
+            Number of steps ahead to predict.
+
+        Returns
+        -------
+        torch.Tensor
+            Sample tensor of shape (n_series, num_samples, prediction_length).
+        """
+        device_type = (
+            "cuda" if str(self._config["device_map"]).startswith("cuda") else "cpu"
+        )
+        if device_type == "cuda":
+            amp_dtype = torch.float16
+            amp_enabled = True
+        else:
+            amp_dtype = torch.bfloat16
+            amp_enabled = _cpu_supports_bf16()
+
+        # scope the intra-op thread count to this call, so forecasters
+        # running inside parallel pipelines do not oversubscribe cores
+        num_threads = self._config["num_threads"]
+        prev_threads = None
+        if num_threads:
+            _limit_interop_threads()
+            prev_threads = torch.get_num_threads()
+            torch.set_num_threads(num_threads)
+        try:
+            with torch.inference_mode(), torch.autocast(
+                device_type, dtype=amp_dtype, enabled=amp_enabled
+            ):
+                return self._pipeline_predict(context, prediction_length)
+        finally:
+            if prev_threads is not None:
+                torch.set_num_threads(prev_threads)
+
+    def _pipeline_predict(self, context, prediction_length):
+        """Single raw pipeline call with the sampling settings applied."""
+        return self.model_pipeline.predict(
+            context,
+            prediction_length,
+            num_samples=self._config["num_samples"],
+            temperature=self._config["temperature"],
+            top_k=self._config["top_k"],
+            top_p=self._config["top_p"],
+            limit_prediction_length=self._config["limit_prediction_length"],
+        )
+
+    @staticmethod
+    def _build_context(_y, context_length):
+        """Assemble the batched context tensor for a single pipeline call.
+
+        Parameters
+        ----------
+        _y : np.ndarray
+            Panel of shape (n_series, length, 1).
+        context_length : int
+            Maximum number of trailing observations to keep per series.
+
+        Returns
+        -------
+        torch.Tensor
+            Contiguous float32 tensor of shape (n_series, min(length,
+            context_length)). Passing this single tensor to the pipeline
+            lets Chronos tokenize, embed and encode the whole panel in
+            one batched pass instead of once per series.
+        """
+        context = np.ascontiguousarray(_y[:, -context_length:, 0], dtype=np.float32)
+        return torch.from_numpy(context)
+
+    def _predict(self, fh, y=None, X=None):
+        """Forecast time series at future horizon.
+
+        Parameters
+        ----------
+        fh : ForecastingHorizon
+            The forecasting horizon with the steps ahead to predict.
+        y : pd.DataFrame, optional (default=None)
+            Series to predict from, defaults to the series seen in fit.
+        X : pd.DataFrame, optional (default=None)
+            Ignored, exogeneous data is not supported.
+
+        Returns
+        -------
+        y_pred : pd.DataFrame
+            Point predictions.
+        """
+        if fh is None:
+            fh = self.fh
+        fh = fh.to_relative(self.cutoff)
+
+        # no defensive copy: the context tensor built below is a fresh
+        # buffer, so aliasing the stored series is safe
+        if y is not None:
+            _y = y
+            is_multi = isinstance(_y.index, pd.MultiIndex)
+        else:
+            _y = self._y
+            is_multi = self._y_is_multi
+
+        transformers.set_seed(self._seed)
+        prediction_length = max(fh._values)
+
+        # fast path for a single flat-indexed series: skips the panel
+        # reshape and the MultiIndex construction below entirely
+        if not is_multi:
+            return self._predict_single_series(_y, prediction_length)
+
+        _y_df = _y
+        use_cached_dims = y is None and len(_y) == self._y_n_series * self._y_length
+        if use_cached_dims:
+            # invariants were validated in fit, reshape via cached dims
+            _y = _y.to_numpy(dtype=np.float32).reshape(
+                (self._y_n_series, self._y_length, len(self._y_columns))
+            )
+        else:
+            _y = _frame2numpy(_y)
+
+        # batch series into as few forward passes as memory allows:
+        # (batch_size, context_length) tensors instead of one call per series
+        context = self._build_context(_y, self._config["context_length"])
+
+        batch_size = self._resolve_batch_size(context.shape[0])
+        if batch_size >= context.shape[0]:
+            prediction_results = self._predict_samples(context, prediction_length)
+        else:
+            prediction_results = torch.cat(
+                [
+                    self._predict_samples(chunk, prediction_length)
+                    for chunk in torch.split(context, batch_size, dim=0)
+                ],
+                dim=0,
+            )
+        # median over the sample dimension, shape (n_series, prediction_length);
+        # the pipeline returns float32 samples on CPU, so this runs on host
+        median = _reduce_samples(prediction_results)
+        # one contiguous (n_series, prediction_length) result buffer,
+        # kept across calls and reused while the shape is unchanged, as
+        # in rolling-origin evaluation; filled in place from the median
+        buf_key = (_y.shape[0], prediction_length)
+        if self._pred_buf_key != buf_key:
+            self._pred_buf = np.empty(buf_key, dtype=np.float32)
+            self._pred_buf_key = buf_key
+        results = self._pred_buf
+        # copy the CPU median tensor straight into the persistent buffer,
+        # so no per-call result array is allocated
+        torch.from_numpy(results).copy_(median)
+
+        # absolute horizon of the raw forecast
+        fh_abs = (
+            ForecastingHorizon(range(1, prediction_length + 1), freq=self.fh.freq)
+            .to_absolute(self._cutoff)
+            ._values
+        )
+        # restrict to the requested horizon before building the frame,
+        # so the output is allocated at its final size directly
+        pred_out = self.fh.to_absolute(self.cutoff)._values
+        keep = fh_abs.isin(pred_out)
+        fh_kept = fh_abs[keep]
+
+        # repeat the instance index level-wise, keeping dtypes intact and
+        # avoiding a python-list round-trip through the MultiIndex
+        if use_cached_dims:
+            lower = self._y_instances
+        else:
+            lower = _y_df.index.droplevel(-1).unique()
+        if isinstance(lower, pd.MultiIndex):
+            ins = [
+                np.repeat(lower.get_level_values(k).values, len(fh_kept))
+                for k in range(lower.nlevels)
+            ]
+        else:
+            ins = [np.repeat(lower.values, len(fh_kept))]
+
+        idx = np.tile(fh_kept, results.shape[0])
+        index = pd.MultiIndex.from_arrays(
+            ins + [idx],
+            names=_y_df.index.names,
+        )
+
+        # flatten series-major from the contiguous buffer, matching the
+        # series-major index construction above
+        return pd.DataFrame(
+            results[:, keep].reshape(-1, 1),
+            index=index,
+            columns=_y_df.columns,
+        )
+
+    @classmethod
+    def get_test_params(cls, parameter_set="default"):
+        """Return testing parameter settings for the estimator.
+
+        Parameters
+        ----------
+        parameter_set : str, default="default"
+            Name of the set of test parameters to return, for use in tests. If
+            no special parameters are defined for a value, will return
+            ``"default"`` set.
+
+        Returns
+        -------
+        params : dict or list of dict
+        """
+        params = [
+            {
+                "model_path": "amazon/chronos-t5-tiny",
+                "config": {
+                    "num_samples": 20,
+                },
+                "seed": 42,
+            },
+        ]
+        return params
+
+
+if _check_soft_dependencies("numba", severity="none"):
+    from numba import njit
+
+    @njit(cache=True, boundscheck=False)
+    def _all_rows_equal_first(a):
+        """Check that every row of a 2D numeric array equals the first row.
+
+        Early-exits on the first mismatch and allocates no intermediate
+        boolean mask, unlike the equivalent vectorized comparison.
+        """
+        for k in range(1, a.shape[0]):
+            for j in range(a.shape[1]):
+                if a[k, j] != a[0, j]:
+                    return False
+        return True
+
+else:
+
+    def _all_rows_equal_first(a):
+        """Check that every row of a 2D numeric array equals the first row."""
+        return bool((a == a[0]).all())
+
+
+def _same_index(data):
+    # vectorized check that all series share the same last-level index,
+    # avoiding a python-level groupby-apply over the panel
+    last_level = data.index.get_level_values(-1)
+    n_series = data.index.droplevel(-1).nunique()
+    assert len(data) % n_series == 0, "All series must have the same index"
+    length = len(data) // n_series
+    values = last_level.values
+    if values.dtype.kind in "mM":
+        values = values.view("int64")
+    timepoints = values.reshape(n_series, length)
+    if timepoints.dtype.kind in "iuf":
+        same = _all_rows_equal_first(timepoints)
+    else:
+        # non-numeric index types, e.g. period or string, take the
+        # vectorized comparison path
+        same = bool((timepoints == timepoints[0]).all())
+    assert same, "All series must have the same index"
+    return last_level[:length], length
+
+
+def _frame2numpy(data):
+    idx, length = _same_index(data)
+    arr = data.to_numpy(dtype=np.float32).reshape((-1, length, len(data.columns)))
+    return arr
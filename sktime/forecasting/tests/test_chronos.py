@@ -0,0 +1,202 @@
+# copyright: sktime developers, BSD-3-Clause License (see LICENSE file)
+"""Tests for the Chronos forecaster."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from sktime.forecasting import chronos
+from sktime.forecasting.chronos import (
+    ChronosForecaster,
+    _all_rows_equal_first,
+    _frame2numpy,
+    _same_index,
+)
+from sktime.tests.test_switch import run_test_for_class
+
+__author__ = ["Z-Fran"]
+
+
+def _make_panel(last_values, length=20, freq="D"):
+    """Build an equal-length panel whose series end in the given values."""
+    times = pd.date_range("2000-01-01", periods=length, freq=freq)
+    index = pd.MultiIndex.from_product(
+        [[f"s{i}" for i in range(len(last_values))], times],
+        names=["instance", "time"],
+    )
+    values = np.concatenate(
+        [np.linspace(last - length + 1, last, length) for last in last_values]
+    )
+    return pd.DataFrame({"value": values}, index=index)
+
+
+class _MockChronosPipeline:
+    """Minimal stand-in for chronos.ChronosPipeline.
+
+    ``predict`` returns identical samples whose value at step h is the
+    last context value plus h, so forecasts are fully determined by the
+    series they belong to, and call shapes are recorded for inspection.
+    """
+
+    def __init__(self, num_samples=5, bump=0.0):
+        self.num_samples = num_samples
+        self.bump = bump
+        self.n_calls = 0
+        self.call_shapes = []
+
+    def predict(self, context, prediction_length, num_samples=None, **kwargs):
+        import torch
+
+        self.call_shapes.append(tuple(context.shape))
+        num_samples = num_samples or self.num_samples
+        steps = torch.arange(1, prediction_length + 1, dtype=torch.float32)
+        base = context[:, -1].unsqueeze(-1) + steps + self.bump * self.n_calls
+        self.n_calls += 1
+        return base.unsqueeze(1).repeat(1, num_samples, 1)
+
+
+def _make_forecaster(monkeypatch, config=None):
+    """Create a ChronosForecaster whose fit picks up a mock pipeline.
+
+    fit resets the estimator, so the mock cannot be assigned directly;
+    patching the module-level loader makes fit install it instead.
+    """
+    pipeline = _MockChronosPipeline(num_samples=(config or {}).get("num_samples") or 5)
+    monkeypatch.setattr(chronos, "_load_pipeline", lambda *args, **kwargs: pipeline)
+    forecaster = ChronosForecaster("mock-model-path", config=config, seed=42)
+    return forecaster, pipeline
+
+
+def test_all_rows_equal_first():
+    """Test the row equality kernel, including the numba py_func if compiled."""
+    impls = [_all_rows_equal_first]
+    if hasattr(_all_rows_equal_first, "py_func"):
+        impls.append(_all_rows_equal_first.py_func)
+
+    equal = np.tile(np.arange(6, dtype=np.int64), (4, 1))
+    unequal = equal.copy()
+    unequal[2, 3] = -1
+    for impl in impls:
+        assert impl(equal)
+        assert not impl(unequal)
+
+
+def test_same_index_accepts_shared_index():
+    """Test that panels with a shared time index pass validation."""
+    data = _make_panel([10.0, 20.0, 30.0], length=7)
+    idx, length = _same_index(data)
+    assert length == 7
+    assert idx.equals(data.loc["s0"].index)
+
+
+def test_same_index_rejects_mismatched_index():
+    """Test that panels with differing time indexes are rejected."""
+    data = _make_panel([10.0, 20.0], length=7)
+    shifted = data.index.to_frame(index=False)
+    shifted.loc[shifted.index[-1], "time"] = pd.Timestamp("2099-01-01")
+    data.index = pd.MultiIndex.from_frame(shifted)
+    with pytest.raises(AssertionError):
+        _same_index(data)
+
+
+def test_frame2numpy_shape_and_order():
+    """Test that _frame2numpy reshapes series-major with float32 values."""
+    data = _make_panel([10.0, 20.0, 30.0], length=5)
+    arr = _frame2numpy(data)
+    assert arr.shape == (3, 5, 1)
+    assert arr.dtype == np.float32
+    np.testing.assert_allclose(arr[:, -1, 0], [10.0, 20.0, 30.0])
+
+
+@pytest.mark.skipif(
+    not run_test_for_class(ChronosForecaster),
+    reason="run test only if softdeps are present and incrementally (if requested)",
+)
+def test_multi_series_row_alignment(monkeypatch):
+    """Test that forecasts land on the rows of the series they came from."""
+    y = _make_panel([0.0, 100.0, 200.0])
+    forecaster, _ = _make_forecaster(monkeypatch, config={"num_samples": 3})
+    forecaster.fit(y)
+    y_pred = forecaster.predict(fh=[1, 2, 3])
+
+    assert y_pred.shape == (9, 1)
+    for i, last in enumerate([0.0, 100.0, 200.0]):
+        np.testing.assert_allclose(
+            y_pred.loc[f"s{i}", "value"].to_numpy(), last + np.arange(1, 4)
+        )
+
+
+@pytest.mark.skipif(
+    not run_test_for_class(ChronosForecaster),
+    reason="run test only if softdeps are present and incrementally (if requested)",
+)
+def test_horizon_filtering(monkeypatch):
+    """Test that only the requested horizon steps are returned."""
+    y = _make_panel([0.0, 100.0])
+    forecaster, _ = _make_forecaster(monkeypatch, config={"num_samples": 3})
+    forecaster.fit(y)
+    y_pred = forecaster.predict(fh=[2, 5])
+
+    assert y_pred.shape == (4, 1)
+    expected_times = y.loc["s0"].index[-1] + pd.to_timedelta([2, 5], unit="D")
+    for i, last in enumerate([0.0, 100.0]):
+        block = y_pred.loc[f"s{i}", "value"]
+        pd.testing.assert_index_equal(block.index, expected_times, check_names=False)
+        np.testing.assert_allclose(block.to_numpy(), [last + 2, last + 5])
+
+
+@pytest.mark.skipif(
+    not run_test_for_class(ChronosForecaster),
+    reason="run test only if softdeps are present and incrementally (if requested)",
+)
+def test_single_series_fast_path(monkeypatch):
+    """Test the flat-index fast path returns a flat-indexed forecast."""
+    times = pd.date_range("2000-01-01", periods=20, freq="D")
+    y = pd.DataFrame({"value": np.arange(20.0)}, index=times)
+    forecaster, _ = _make_forecaster(monkeypatch, config={"num_samples": 3})
+    forecaster.fit(y)
+    y_pred = forecaster.predict(fh=[1, 3])
+
+    assert not isinstance(y_pred.index, pd.MultiIndex)
+    np.testing.assert_allclose(y_pred["value"].to_numpy(), [20.0, 22.0])
+
+
+@pytest.mark.skipif(
+    not run_test_for_class(ChronosForecaster),
+    reason="run test only if softdeps are present and incrementally (if requested)",
+)
+def test_batch_size_chunking(monkeypatch):
+    """Test that panels are chunked by batch_size and results reassembled."""
+    last_values = [0.0, 100.0, 200.0, 300.0, 400.0]
+    y = _make_panel(last_values)
+    forecaster, pipeline = _make_forecaster(
+        monkeypatch, config={"num_samples": 3, "batch_size": 2}
+    )
+    forecaster.fit(y)
+    y_pred = forecaster.predict(fh=[1, 2])
+
+    assert pipeline.call_shapes == [(2, 20), (2, 20), (1, 20)]
+    for i, last in enumerate(last_values):
+        np.testing.assert_allclose(
+            y_pred.loc[f"s{i}", "value"].to_numpy(), [last + 1, last + 2]
+        )
+
+
+@pytest.mark.skipif(
+    not run_test_for_class(ChronosForecaster),
+    reason="run test only if softdeps are present and incrementally (if requested)",
+)
+def test_buffer_reuse_does_not_mutate_returned_frames(monkeypatch):
+    """Test that reusing the result buffer leaves earlier outputs intact."""
+    y = _make_panel([0.0, 100.0])
+    forecaster, pipeline = _make_forecaster(monkeypatch, config={"num_samples": 3})
+    # bump makes every pipeline call return different values, so a second
+    # predict would show through any aliasing of the first result
+    pipeline.bump = 1000.0
+    forecaster.fit(y)
+
+    first = forecaster.predict(fh=[1, 2])
+    first_values = first.to_numpy().copy()
+    second = forecaster.predict(fh=[1, 2])
+
+    assert not np.allclose(first_values, second.to_numpy())
+    np.testing.assert_allclose(first.to_numpy(), first_values)